@@ -23,3 +23,9 @@ CREATE TABLE banned_words   (word TEXT PRIMARY KEY);
 CREATE TABLE aux_words      (word TEXT PRIMARY KEY);
 CREATE TABLE greeting_words (word TEXT PRIMARY KEY);
 CREATE TABLE swap_pairs     (from_word TEXT NOT NULL, to_word TEXT NOT NULL);
+
+-- Training lines streamed in with COPY, consumed by megahal_learn_from_staging()
+CREATE TABLE training_staging (
+    id   BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    line TEXT NOT NULL
+);
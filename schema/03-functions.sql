@@ -1184,3 +1184,37 @@ LANGUAGE sql VOLATILE AS $$
     )
     FROM megahal_learn(input)
 $$;
+
+-- megahal_converse_seeded(seed, input, num_candidates)
+--
+-- setseed(seed), then megahal_converse(input, num_candidates). A
+-- reproducible conversational turn in one call, without a separate
+-- round-trip for setseed.
+CREATE OR REPLACE FUNCTION megahal_converse_seeded(
+    seed double precision, input text, num_candidates int DEFAULT 10
+)
+RETURNS text
+LANGUAGE sql VOLATILE AS $$
+    SELECT setseed(seed);
+    SELECT megahal_converse(input, num_candidates);
+$$;
+
+-- megahal_learn_from_staging()
+--
+-- Learn from the lines in training_staging, in the order they were loaded,
+-- then empty the table. Lets a client stream a large corpus in with
+-- COPY ... FROM STDIN instead of binding it as one giant text parameter.
+CREATE OR REPLACE FUNCTION megahal_learn_from_staging()
+RETURNS TABLE(tokens_learned bigint, lines_learned bigint, lines_processed bigint)
+LANGUAGE sql VOLATILE AS $$
+    WITH learned AS (
+        SELECT * FROM megahal_learn(
+            (SELECT coalesce(string_agg(line, E'\n' ORDER BY id), '')
+             FROM training_staging)
+        )
+    ),
+    cleared AS (
+        DELETE FROM training_staging
+    )
+    SELECT * FROM learned
+$$;
@@ -0,0 +1,2 @@
+# C's output_none (megahal.c), which megahal_reply returns when it can't reply
+FALLBACK_REPLY = "I don't know enough to answer you yet!"
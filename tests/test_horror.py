@@ -1,22 +1,9 @@
 """Test THE HORROR -- complete text-in -> text-out single SQL statement."""
 
-from pathlib import Path
 
-
-DATA_DIR = Path(__file__).resolve().parent.parent / "data"
-
-
-def _train(conn, filepath):
-    """Load a training file via megahal_learn."""
-    text = Path(filepath).read_text()
-    conn.execute("SELECT * FROM megahal_learn(%s)", (text,))
-
-
-def test_horror_returns_formatted_text(db):
+def test_horror_returns_formatted_text(trained_db):
     """The horror takes text and returns a formatted reply string."""
-    _train(db, DATA_DIR / "megahal.trn")
-
-    row = db.execute(
+    row = trained_db.execute(
         "SELECT megahal_reply(%s, %s)", ("hello there", 5)
     ).fetchone()
 
@@ -30,13 +17,11 @@ def test_horror_returns_formatted_text(db):
     assert first_alpha.isupper(), f"First alpha char should be uppercase: {reply}"
 
 
-def test_horror_ends_with_punctuation(db):
+def test_horror_ends_with_punctuation(trained_db):
     """Horror replies should end with terminal punctuation."""
-    _train(db, DATA_DIR / "megahal.trn")
-
     inputs = ["hello", "what is the meaning of life", "tell me about dogs"]
     for text in inputs:
-        row = db.execute(
+        row = trained_db.execute(
             "SELECT megahal_reply(%s, %s)", (text, 5)
         ).fetchone()
         assert row is not None
@@ -45,13 +30,11 @@ def test_horror_ends_with_punctuation(db):
         assert reply.rstrip()[-1] in '.!?', f"Reply should end with punctuation: '{reply}'"
 
 
-def test_horror_different_inputs(db):
+def test_horror_different_inputs(trained_db):
     """Different inputs tend to produce different replies."""
-    _train(db, DATA_DIR / "megahal.trn")
-
     replies = set()
     for text in ["hello", "what is life", "tell me about dogs"]:
-        row = db.execute(
+        row = trained_db.execute(
             "SELECT megahal_reply(%s, %s)", (text, 5)
         ).fetchone()
         if row:
@@ -1,49 +1,75 @@
 """Test the Learning Horror -- single SQL statement for all trie learning."""
 
+from collections import defaultdict
+
+from driver import scalar
+
+
+def _copy_rows(conn, query, types):
+    """Fetch a query's rows via binary COPY ... TO STDOUT."""
+    with conn.cursor() as cur:
+        with cur.copy(f"COPY ({query}) TO STDOUT WITH (FORMAT BINARY)") as copy:
+            copy.set_types(types)
+            return list(copy.rows())
+
 
 def _dump_trie(conn):
     """Dump trie state as {(tree, word_path): (count, usage)} for comparison.
 
     Normalizes by word paths (not node IDs) so results are comparable
     across different execution orders, which may assign different IDs.
+    Paths are rebuilt client-side from flat scans of symbols and trie_nodes,
+    which is linear in the number of nodes. The scans are streamed with
+    binary COPY, the cheapest bulk result path psycopg has.
     """
-    rows = conn.execute("""
-        WITH RECURSIVE tree AS (
-            SELECT id, tree, ARRAY[]::text[] AS path, usage, count
-            FROM trie_nodes WHERE parent_id IS NULL
-            UNION ALL
-            SELECT tn.id, tn.tree, t.path || s.word, tn.usage, tn.count
-            FROM trie_nodes tn
-            JOIN tree t ON tn.parent_id = t.id AND tn.tree = t.tree
-            JOIN symbols s ON s.id = tn.symbol
+    words = dict(
+        _copy_rows(conn, "SELECT id, word FROM symbols", ["int4", "text"])
+    )
+    roots = []
+    children = defaultdict(list)
+    for node_id, parent_id, tree, symbol, count, usage in _copy_rows(
+        conn,
+        "SELECT id, parent_id, tree, symbol, count, usage FROM trie_nodes",
+        ["int4", "int4", "bpchar", "int4", "int4", "int4"],
+    ):
+        node = (node_id, tree.strip(), symbol, count, usage)
+        if parent_id is None:
+            roots.append(node)
+        else:
+            children[parent_id].append(node)
+
+    state = {}
+    stack = [(node, ()) for node in roots]
+    while stack:
+        (node_id, tree, _symbol, count, usage), path = stack.pop()
+        state[(tree, path)] = (count, usage)
+        stack.extend(
+            (child, path + (words[child[2]],)) for child in children[node_id]
         )
-        SELECT tree, path, count, usage FROM tree
-        ORDER BY tree, path
-    """).fetchall()
-    return {(r[0].strip(), tuple(r[1])): (r[2], r[3]) for r in rows}
+    return state
 
 
 def test_learn_horror_creates_trie_nodes(db):
     """Learning via SQL creates forward and backward trie nodes."""
     conn = db
 
-    before = conn.execute("SELECT count(*) FROM trie_nodes").fetchone()[0]
+    before = scalar(conn, "SELECT count(*) FROM trie_nodes")
 
     conn.execute(
         "SELECT * FROM megahal_learn(%s)",
         ("Hello world this is a test sentence.",),
     )
 
-    after = conn.execute("SELECT count(*) FROM trie_nodes").fetchone()[0]
+    after = scalar(conn, "SELECT count(*) FROM trie_nodes")
     assert after > before, "Learning should create new trie nodes"
 
     # Both forward and backward trees should have new nodes
-    fwd = conn.execute(
-        "SELECT count(*) FROM trie_nodes WHERE tree = 'F' AND parent_id IS NOT NULL"
-    ).fetchone()[0]
-    bwd = conn.execute(
-        "SELECT count(*) FROM trie_nodes WHERE tree = 'B' AND parent_id IS NOT NULL"
-    ).fetchone()[0]
+    fwd = scalar(
+        conn, "SELECT count(*) FROM trie_nodes WHERE tree = 'F' AND parent_id IS NOT NULL"
+    )
+    bwd = scalar(
+        conn, "SELECT count(*) FROM trie_nodes WHERE tree = 'B' AND parent_id IS NOT NULL"
+    )
     assert fwd > 0, "Forward trie should have nodes"
     assert bwd > 0, "Backward trie should have nodes"
 
@@ -72,18 +98,18 @@ def test_learn_horror_skips_short_input(db):
     """Inputs with <= order tokens should not create any trie nodes."""
     conn = db
 
-    before = conn.execute("SELECT count(*) FROM trie_nodes").fetchone()[0]
-    before_usage = conn.execute(
-        "SELECT sum(usage) FROM trie_nodes WHERE parent_id IS NULL"
-    ).fetchone()[0]
+    before = scalar(conn, "SELECT count(*) FROM trie_nodes")
+    before_usage = scalar(
+        conn, "SELECT sum(usage) FROM trie_nodes WHERE parent_id IS NULL"
+    )
 
     # "hi" tokenizes to very few tokens (< order=5)
     conn.execute("SELECT * FROM megahal_learn(%s)", ("hi",))
 
-    after = conn.execute("SELECT count(*) FROM trie_nodes").fetchone()[0]
-    after_usage = conn.execute(
-        "SELECT sum(usage) FROM trie_nodes WHERE parent_id IS NULL"
-    ).fetchone()[0]
+    after = scalar(conn, "SELECT count(*) FROM trie_nodes")
+    after_usage = scalar(
+        conn, "SELECT sum(usage) FROM trie_nodes WHERE parent_id IS NULL"
+    )
     assert after == before, "Short input should not create trie nodes"
     assert after_usage == before_usage, "Short input should not change root usage"
 
@@ -13,6 +13,8 @@ best_candidate CTEs in schema/03-functions.sql, fed controlled candidate rows
 so the precedence is exercised deterministically without the random walk.
 """
 
+from tests import FALLBACK_REPLY
+
 
 # Mirrors PHASE 7 of megahal_reply: pick the dissimilar keyword candidate with
 # the highest score (earliest generation breaks ties); fall back to the
@@ -180,4 +182,4 @@ def test_fallback_string_matches_c(db):
     (reply,) = db.execute(
         "SELECT megahal_reply(%s, %s)", ("anything at all", 5)
     ).fetchone()
-    assert reply == "I don't know enough to answer you yet!"
+    assert reply == FALLBACK_REPLY
@@ -1,3 +1,6 @@
+from driver import load_support_data
+
+
 def test_banned_words_loaded(db):
     (count,) = db.execute("SELECT count(*) FROM banned_words").fetchone()
     assert count == 384
@@ -31,3 +34,21 @@ def test_swap_pairs_loaded(db):
         "SELECT to_word FROM swap_pairs WHERE from_word = 'YOU' ORDER BY to_word"
     ).fetchall()
     assert [r[0] for r in rows] == ["I", "ME"]
+
+
+def test_support_data_survives_copy_escaping(db, tmp_path):
+    """Backslashes, embedded tabs and non-ASCII words load verbatim."""
+    (tmp_path / "megahal.ban").write_text("BACK\\SLASH\nTAB\tBED\n")
+    (tmp_path / "megahal.aux").write_text("")
+    (tmp_path / "megahal.grt").write_text("CAF\u00c9\n")
+    (tmp_path / "megahal.swp").write_text("C:\\\tD:\\\n")
+
+    db.execute("TRUNCATE banned_words, aux_words, greeting_words, swap_pairs")
+    load_support_data(db, tmp_path)
+
+    rows = db.execute("SELECT word FROM banned_words ORDER BY word").fetchall()
+    assert rows == [("BACK\\SLASH",), ("TAB\tBED",)]
+    rows = db.execute("SELECT word FROM greeting_words").fetchall()
+    assert rows == [("CAF\u00c9",)]
+    rows = db.execute("SELECT from_word, to_word FROM swap_pairs").fetchall()
+    assert rows == [("C:\\", "D:\\")]
@@ -2,15 +2,40 @@
 
 from pathlib import Path
 
+from psycopg.adapt import Dumper
+from psycopg.postgres import types
+from psycopg.pq import Format
+from psycopg.rows import scalar_row
+
+from driver import learn_file
+
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 
 
+class _Utf8TextDumper(Dumper):
+    """Send already-encoded UTF-8 bytes as a binary-format text parameter.
+
+    Binary text on the wire is just the UTF-8 bytes, so the file contents go
+    out as read, with no decode to str and re-encode on the way.
+    """
+
+    format = Format.BINARY
+    oid = types["text"].oid
+
+    def dump(self, obj):
+        return obj
+
+
 def _train(conn, filepath):
-    """Load a training file via megahal_learn -- read file, pass as string."""
-    text = Path(filepath).read_text()
-    row = conn.execute("SELECT * FROM megahal_learn(%s)", (text,)).fetchone()
-    return row[2] or 0  # lines_processed
+    """Load a training file via megahal_learn -- read file, pass as text."""
+    text = Path(filepath).read_bytes()
+    cur = conn.cursor(row_factory=scalar_row)
+    cur.adapters.register_dumper(bytes, _Utf8TextDumper)
+    processed = cur.execute(
+        "SELECT lines_processed FROM megahal_learn(%b)", (text,)
+    ).fetchone()
+    return processed or 0
 
 
 def test_training_populates_symbols(db):
@@ -75,3 +100,25 @@ def test_training_skips_comments(db):
     assert count == 3  # only non-comment, non-empty lines
 
     Path(tmp_path).unlink()
+
+
+def test_learn_file_matches_single_string(db):
+    """Streaming a file through training_staging learns the same as passing
+    the whole file to megahal_learn, and leaves the staging table empty."""
+    path = DATA_DIR / "megahal.trn"
+
+    db.execute("SAVEPOINT before_learn")
+    expected = db.execute(
+        "SELECT * FROM megahal_learn(%s)", (path.read_text(),)
+    ).fetchone()
+    expected_syms = db.execute(
+        "SELECT word FROM symbols ORDER BY id"
+    ).fetchall()
+    db.execute("ROLLBACK TO SAVEPOINT before_learn")
+
+    assert learn_file(db, path) == expected
+    assert db.execute(
+        "SELECT word FROM symbols ORDER BY id"
+    ).fetchall() == expected_syms
+    (staged,) = db.execute("SELECT count(*) FROM training_staging").fetchone()
+    assert staged == 0